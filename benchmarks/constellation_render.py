@@ -0,0 +1,62 @@
+"""Rendering time of a large constellation animation
+
+Builds a synthetic recording of N_SATELLITES satellites over N_FRAMES
+frames (random walk queue loads and occasional failures), then times a
+still frame and the animation export of ConstellationRenderer.
+
+Run from the repository root:
+    python benchmarks/constellation_render.py [frames]
+"""
+import os
+import sys
+import tempfile
+import time
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DEFAULT_CONFIG
+from utils.constellation import ConstellationRenderer
+
+N_SATELLITES = 1000
+N_FRAMES = 600
+
+def synthetic_recording(config, n_satellites, n_frames):
+    rng = np.random.default_rng(1)
+    steps = rng.integers(-3, 4, (n_frames, n_satellites))
+    load = np.clip(np.cumsum(steps, axis=0) + config.MAX_QUEUE_SIZE // 2, 0, config.MAX_QUEUE_SIZE)
+    return {
+        'time': np.arange(n_frames, dtype=float) * 10,
+        'load': load.astype(np.int16),
+        'failed': rng.random((n_frames, n_satellites)) < 0.02,
+        'max_queue_size': config.MAX_QUEUE_SIZE,
+        'altitude': config.ALTITUDE,
+        'orbit_planes': 20,
+        'inclination': config.INCLINATION,
+        'walker_phasing': config.WALKER_PHASING,
+    }
+
+def main():
+    n_frames = int(sys.argv[1]) if len(sys.argv) > 1 else N_FRAMES
+    recording = synthetic_recording(DEFAULT_CONFIG, N_SATELLITES, n_frames)
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        start = time.perf_counter()
+        renderer = ConstellationRenderer(recording, output_dir=output_dir)
+        print(f"Positions for {n_frames} frames: {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        renderer.render_frame()
+        print(f"Still frame: {time.perf_counter() - start:.2f}s")
+
+        start = time.perf_counter()
+        path = renderer.animate()
+        elapsed = time.perf_counter() - start
+        print(f"Animation ({os.path.basename(path)}, {N_SATELLITES} satellites, {n_frames} frames): "
+              f"{elapsed:.1f}s, {elapsed / n_frames * 1000:.0f}ms per frame")
+        renderer.close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Summaries of a run degraded by MEMORY_BUDGET_MB versus a full run
+
+Runs the same seed with and without a memory budget small enough to
+trim raw samples throughout the run, then checks that summaries with
+warm-up cuts at metric interval starts, or after the trimmed samples,
+match the full run and that other cuts within the trimmed samples are
+rejected. Finally runs seeded replications with MSER warm-up truncation
+both ways and compares their warm-up cuts and summaries.
+
+Run from the repository root:
+    python benchmarks/memory_budget.py
+"""
+import math
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DEFAULT_CONFIG
+from run_simulation import run_simulation
+from utils import ReplicationManager
+
+SEED = 7
+REPLICATIONS = 3
+
+def mismatched(expected, actual):
+    return [
+        name for name, value in expected.items()
+        if not math.isclose(value, actual[name], rel_tol=1e-9, abs_tol=1e-9)
+    ]
+
+def compare(full, degraded, warmup_time):
+    expected = full.get_performance_summary(warmup_time=warmup_time)
+    actual = degraded.get_performance_summary(warmup_time=warmup_time)
+    mismatches = mismatched(expected, actual)
+    status = 'OK' if not mismatches else 'MISMATCH ' + ', '.join(mismatches)
+    print(f"warm-up {warmup_time:.2f}s: {status}")
+    return not mismatches
+
+def main():
+    config = DEFAULT_CONFIG.replace(SIM_TIME=200, CACHE_ENABLED=False)
+    full = run_simulation(config, seed=SEED, generate_plots=False)
+    degraded = run_simulation(config.replace(MEMORY_BUDGET_MB=1), seed=SEED, generate_plots=False)
+    if not degraded.trimmed_samples:
+        sys.exit("The budget did not trigger degradation")
+    print(f"{degraded.trimmed_samples} raw samples trimmed up to t={degraded.trimmed_until:.2f}s")
+
+    # Interval starts within the trimmed samples, and cuts after them
+    # including one before any retained sample
+    later = [time for time in degraded.metrics['time'] if time > degraded.trimmed_until]
+    warmups = [0, 21, 50, 150, (degraded.trimmed_until + later[0]) / 2, later[len(later) // 2]]
+    ok = all([compare(full, degraded, warmup_time) for warmup_time in warmups])
+
+    for warmup_time in (50.5, degraded.trimmed_until):
+        try:
+            degraded.get_performance_summary(warmup_time=warmup_time)
+        except ValueError:
+            print(f"warm-up {warmup_time:.2f}s: rejected")
+        else:
+            print(f"warm-up {warmup_time:.2f}s: NOT rejected")
+            ok = False
+
+    ok = compare_replications(config) and ok
+    sys.exit(0 if ok else 1)
+
+def compare_replications(config):
+    config = config.replace(REPLICATION_MIN=REPLICATIONS, REPLICATION_MAX=REPLICATIONS)
+    results = [
+        ReplicationManager(run_simulation, run_config, n_workers=REPLICATIONS, truncate_warmup=True).run()
+        for run_config in (config, config.replace(MEMORY_BUDGET_MB=1))
+    ]
+    ok = True
+    for i, (full, degraded) in enumerate(zip(*(result['summaries'] for result in results))):
+        cut = results[0]['warmup_times'][i]
+        mismatches = mismatched(full, degraded)
+        if results[1]['warmup_times'][i] != cut:
+            mismatches.append('warmup_time')
+        print(f"replication {i + 1} (warm-up {cut:.1f}s): "
+              + ('OK' if not mismatches else 'MISMATCH ' + ', '.join(mismatches)))
+        ok = ok and not mismatches
+    return ok
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Per-packet cost of batched versus per-packet service metrics
+
+Feeds the same synthetic served packets through Satellite's per-packet
+path (calculate_latency, calculate_energy, update_metrics) and through
+ServiceBatcher (service_kernel, update_metrics_batch), then prints the
+cost per packet and the latency/energy distributions of both. Interval
+summaries are computed the same way by both paths, so they are left out
+by using a single metric interval.
+
+Run from the repository root:
+    python benchmarks/service_kernel.py
+"""
+import math
+import os
+import random
+import sys
+import time
+import numpy as np
+import simpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DEFAULT_CONFIG
+from models import Satellite, Packet, ServiceBatcher
+from utils import MetricsCollector
+
+N_PACKETS = 200000
+QUEUE_LENGTH = 30
+BATCH_SIZES = [32, 128, 512]
+
+def make_satellite(config):
+    env = simpy.Environment()
+    metrics = MetricsCollector(config)
+    satellite = Satellite(env, 'Sat-bench', metrics, config)
+    satellite.queue.extend(Packet(0, 0) for _ in range(QUEUE_LENGTH))
+    satellite.current_load = QUEUE_LENGTH
+    satellite.last_packet_time = math.inf  # Silence the periodic packet log
+    return satellite, metrics
+
+def bench_per_packet(config, times, sizes):
+    satellite, metrics = make_satellite(config.replace(SERVICE_BATCH_SIZE=1))
+    start = time.perf_counter()
+    for now, size in zip(times, sizes):
+        packet = Packet(size, now)
+        latency = satellite.calculate_latency(packet)
+        energy = satellite.calculate_energy(packet)
+        metrics.update_metrics(now, size, latency, energy)
+    return time.perf_counter() - start, metrics
+
+def bench_batched(config, times, sizes, batch_size):
+    config = config.replace(SERVICE_BATCH_SIZE=batch_size)
+    satellite, metrics = make_satellite(config)
+    service = ServiceBatcher(metrics, config)
+    start = time.perf_counter()
+    for now, size in zip(times, sizes):
+        service.add(satellite, now, size, QUEUE_LENGTH, QUEUE_LENGTH, 0)
+    service.flush()
+    return time.perf_counter() - start, metrics
+
+def describe(metrics, name):
+    values = np.asarray(metrics.metrics[name])
+    return (f"mean={values.mean():.4f} std={values.std():.4f} "
+            f"p5={np.percentile(values, 5):.4f} p95={np.percentile(values, 95):.4f}")
+
+def main():
+    random.seed(1)
+    config = DEFAULT_CONFIG.replace(METRIC_INTERVAL=DEFAULT_CONFIG.SIM_TIME)
+    rng = np.random.default_rng(1)
+    times = np.sort(rng.uniform(0, config.SIM_TIME, N_PACKETS)).tolist()
+    sizes = rng.integers(config.PACKET_SIZE_MIN, config.PACKET_SIZE_MAX + 1, N_PACKETS).tolist()
+
+    baseline, reference = bench_per_packet(config, times, sizes)
+    print(f"Per-packet service: {baseline / N_PACKETS * 1e6:.2f} us/packet")
+    print(f"  latency {describe(reference, 'latency')}")
+    print(f"  energy  {describe(reference, 'energy')}")
+
+    for batch_size in BATCH_SIZES:
+        elapsed, metrics = bench_batched(config, times, sizes, batch_size)
+        print(f"Batched service (batch={batch_size}): {elapsed / N_PACKETS * 1e6:.2f} us/packet, "
+              f"{baseline / elapsed:.1f}x faster")
+        print(f"  latency {describe(metrics, 'latency')}")
+        print(f"  energy  {describe(metrics, 'energy')}")
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,119 @@
+from dataclasses import dataclass, field, replace
+
+def _default_figure_sizes():
+    return {
+        'throughput': (12, 8),
+        'latency': (15, 6),
+        'energy': (15, 5),
+        'packet_loss': (12, 6),
+        'combined': (15, 8),
+        'constellation': (10, 10)
+    }
+
+@dataclass(frozen=True)
 class SimConfig:
+    """Immutable simulation parameters
+
+    Variants are created with keyword overrides, e.g. SimConfig(SIM_TIME=600)
+    or config.replace(SATELLITE_COUNT=40), and passed to run_simulation, so
+    any number of scenarios can share one process. Constants derived from
+    the parameters are computed once when the instance is created.
+    """
     # Time settings
-    SIM_TIME = 3000          # 50 minutes
-    TIME_STEP = 0.01         # 10ms steps for granular simulation
-    METRIC_INTERVAL = 1.0    # Collect metrics every second
-    PROGRESS_INTERVAL = 10   # Print progress every 10 seconds
-    
+    SIM_TIME: float = 3000          # 50 minutes
+    TIME_STEP: float = 0.01         # 10ms steps for granular simulation
+    METRIC_INTERVAL: float = 1.0    # Collect metrics every second
+    PROGRESS_INTERVAL: float = 10   # Print progress every 10 seconds
+
     # Network parameters
-    SATELLITE_COUNT = 20     # Increased from 5 to 20 satellites
-    FAILURE_RATE = 300      # One failure every 5 minutes
-    RECOVERY_TIME = 15      # 15 seconds recovery
-    
+    SATELLITE_COUNT: int = 20     # Increased from 5 to 20 satellites
+    FAILURE_RATE: float = 300      # One failure every 5 minutes
+    RECOVERY_TIME: float = 15      # 15 seconds recovery
+
     # Packet parameters
-    PACKET_SIZE_MIN = 10240  # 10KB
-    PACKET_SIZE_MAX = 102400 # 100KB
-    PACKET_RATE = 0.1       # Packet every 100ms
-    
+    PACKET_SIZE_MIN: int = 10240  # 10KB
+    PACKET_SIZE_MAX: int = 102400 # 100KB
+    PACKET_RATE: float = 0.1       # Packet every 100ms
+
     # Queue parameters
-    MAX_QUEUE_SIZE = 75     # Increased queue size
-    PROCESSING_DELAY = 0.01 # 10ms processing delay
-    
+    MAX_QUEUE_SIZE: int = 75     # Increased queue size
+    PROCESSING_DELAY: float = 0.01 # 10ms processing delay
+    SERVICE_BATCH_SIZE: int = 128  # Served packets per vectorized metrics update (1 = per packet)
+
     # Energy parameters
-    BASE_ENERGY = 0.5       # Base energy consumption (mW)
-    ENERGY_PER_BYTE = 0.00001 # Energy per byte adjusted
-    
+    BASE_ENERGY: float = 0.5       # Base energy consumption (mW)
+    ENERGY_PER_BYTE: float = 0.00001 # Energy per byte adjusted
+
     # Network conditions
-    CONGESTION_FACTOR = 1.5
-    JITTER_RANGE = 0.005    # 5ms max jitter
-    
+    CONGESTION_FACTOR: float = 1.5
+    JITTER_RANGE: float = 0.005    # 5ms max jitter
+
     # Satellite parameters
-    ALTITUDE = 550          # km
-    SPEED_OF_LIGHT = 299792 # km/s
-    
+    ALTITUDE: float = 550          # km
+    SPEED_OF_LIGHT: float = 299792 # km/s
+
+    # Constellation geometry (Walker delta) and state recording
+    ORBIT_PLANES: int = 4
+    INCLINATION: float = 53        # degrees
+    WALKER_PHASING: int = 1
+    CONSTELLATION_RECORD_INTERVAL: float = 0  # Seconds between recorded frames, 0 disables
+
     # Visualization parameters
-    DPI = 300
-    PLOT_FORMATS = ['png']
-    FIGURE_SIZES = {
-        'throughput': (12, 8),
-        'latency': (15, 6),
-        'energy': (15, 5),
-        'packet_loss': (12, 6),
-        'combined': (15, 8)
-    }
-    
+    DPI: int = 300
+    PLOT_FORMATS: tuple = ('png',)
+    FIGURE_SIZES: dict = field(default_factory=_default_figure_sizes, hash=False)
+    ANIMATION_FPS: int = 20
+
     # Performance thresholds
-    MAX_LATENCY = 100       # Maximum acceptable latency (ms)
-    TARGET_PACKET_LOSS = 0.05  # Target packet loss rate (5%)
-    MIN_THROUGHPUT = 1.0    # Minimum throughput (MB/s)
+    MAX_LATENCY: float = 100       # Maximum acceptable latency (ms)
+    TARGET_PACKET_LOSS: float = 0.05  # Target packet loss rate (5%)
+    MIN_THROUGHPUT: float = 1.0    # Minimum throughput (MB/s)
+
+    # Replication parameters
+    REPLICATION_MIN: int = 5          # Minimum replications before stopping
+    REPLICATION_MAX: int = 50         # Hard limit on replications
+    REPLICATION_PRECISION: float = 0.05 # Target CI half-width relative to the mean
+    CONFIDENCE_LEVEL: float = 0.95      # Confidence level of the intervals
+    REPLICATION_BASE_SEED: int = 1    # Seed of the first replication
+    MSER_BATCH_SIZE: int = 5          # Batch size for MSER warm-up truncation
+
+    # Result cache parameters (only seeded runs are cached)
+    CACHE_ENABLED: bool = True
+    CACHE_DIR: str = '.cache/results'
+    CACHE_MAX_BYTES: int = 2 * 1024 ** 3  # 2GB, least recently used entries evicted first
+
+    # Memory instrumentation (sampled every PROGRESS_INTERVAL)
+    MEMORY_PROFILING: bool = False     # Attribute allocations to subsystems with tracemalloc
+    MEMORY_BUDGET_MB: float = 0        # RSS budget, 0 disables enforcement
+    MEMORY_SOFT_LIMIT: float = 0.8     # Fraction of the budget that triggers degradation
+    MEMORY_SPILL_DIR: str = ''         # Spill dropped raw samples here instead of discarding them
+
+    # Derived constants, computed in __post_init__
+    PROPAGATION_DELAY_MS: float = field(init=False, repr=False, compare=False)
+    PROCESSING_DELAY_MS: float = field(init=False, repr=False, compare=False)
+    QUEUE_NORM: float = field(init=False, repr=False, compare=False)
+    PACKET_SIZE_NORM: float = field(init=False, repr=False, compare=False)
+    PACKET_BASE_ENERGY: float = field(init=False, repr=False, compare=False)
+    PACKET_ARRIVAL_RATE: float = field(init=False, repr=False, compare=False)
+    NETWORK_CAPACITY: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        derived = {
+            # Round trip ground-satellite-ground (ms)
+            'PROPAGATION_DELAY_MS': 2 * self.ALTITUDE / self.SPEED_OF_LIGHT * 1000,
+            'PROCESSING_DELAY_MS': self.PROCESSING_DELAY * 1000,
+            'QUEUE_NORM': 1 / self.MAX_QUEUE_SIZE,
+            'PACKET_SIZE_NORM': 1 / self.PACKET_SIZE_MAX,
+            # Base plus processing energy, paid by every packet
+            'PACKET_BASE_ENERGY': self.BASE_ENERGY + self.PROCESSING_DELAY * self.BASE_ENERGY,
+            'PACKET_ARRIVAL_RATE': 1.0 / self.PACKET_RATE,
+            'NETWORK_CAPACITY': self.SATELLITE_COUNT * self.MAX_QUEUE_SIZE
+        }
+        for name, value in derived.items():
+            object.__setattr__(self, name, value)
+
+    def replace(self, **changes):
+        """Copy of this configuration with some parameters changed"""
+        return replace(self, **changes)
+
+DEFAULT_CONFIG = SimConfig()
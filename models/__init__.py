@@ -1,5 +1,6 @@
 from .satellite import Satellite
 from .device import D2DDevice
 from .packet import Packet
+from .service import ServiceBatcher
 
-__all__ = ['Satellite', 'D2DDevice', 'Packet']
\ No newline at end of file
+__all__ = ['Satellite', 'D2DDevice', 'Packet', 'ServiceBatcher']
\ No newline at end of file
@@ -1,10 +1,11 @@
 import random
-from config import SimConfig
+from config import DEFAULT_CONFIG
 from .packet import Packet
 
 class D2DDevice:
-    def __init__(self, env, name, satellite):
+    def __init__(self, env, name, satellite, config=DEFAULT_CONFIG):
         self.env = env
+        self.config = config
         self.name = name
         self.satellite = satellite
         self.packets_sent = 0
@@ -16,10 +17,10 @@ class D2DDevice:
         """Generate network traffic with variable packet sizes and rates"""
         while True:
             # Variable packet generation interval
-            yield self.env.timeout(random.expovariate(1.0/SimConfig.PACKET_RATE))
+            yield self.env.timeout(random.expovariate(self.config.PACKET_ARRIVAL_RATE))
             
             # Generate packet with random size
-            size = random.randint(SimConfig.PACKET_SIZE_MIN, SimConfig.PACKET_SIZE_MAX)
+            size = random.randint(self.config.PACKET_SIZE_MIN, self.config.PACKET_SIZE_MAX)
             packet = Packet(size, self.env.now)
             
             # Update statistics
@@ -30,7 +31,7 @@ class D2DDevice:
             self.satellite.send_packet(packet)
             
             # Log traffic generation periodically
-            if self.env.now - self.last_sent_time >= SimConfig.METRIC_INTERVAL:
+            if self.env.now - self.last_sent_time >= self.config.METRIC_INTERVAL:
                 throughput = self.bytes_sent / (1024 * 1024 * max(1, self.env.now))  # MB/s
                 print(f"t={self.env.now:.1f}s: {self.name} generated {self.packets_sent} packets, "
                       f"throughput={throughput:.2f} MB/s")
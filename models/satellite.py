@@ -1,14 +1,19 @@
 import random
 from collections import deque
-from config import SimConfig
+from config import DEFAULT_CONFIG
 
 class Satellite:
-    def __init__(self, env, name, metrics):
+    def __init__(self, env, name, metrics, config=DEFAULT_CONFIG, service=None):
         self.env = env
         self.name = name
         self.metrics = metrics
+        self.config = config
+        
+        # Shared ServiceBatcher for batched metrics, owned and flushed by the
+        # caller (see run_simulation); without one packets are recorded one by one
+        self.service = service
         self.failed = False
-        self.queue = deque(maxlen=SimConfig.MAX_QUEUE_SIZE)
+        self.queue = deque(maxlen=config.MAX_QUEUE_SIZE)
         self.bytes_transmitted = 0
         self.total_packets = 0
         self.lost_packets = 0
@@ -21,20 +26,18 @@ class Satellite:
         self.monitoring_process = env.process(self.monitor_health())
     
     def calculate_latency(self, packet):
-        # Base propagation delay
-        distance = 2 * SimConfig.ALTITUDE  # Round trip
-        propagation_delay = distance / SimConfig.SPEED_OF_LIGHT * 1000  # ms
+        config = self.config
         
         # Queue-dependent processing delay
-        queue_factor = len(self.queue) / SimConfig.MAX_QUEUE_SIZE
-        processing_delay = SimConfig.PROCESSING_DELAY * 1000 * (1 + queue_factor * SimConfig.CONGESTION_FACTOR)
+        queue_factor = len(self.queue) * config.QUEUE_NORM
+        processing_delay = config.PROCESSING_DELAY_MS * (1 + queue_factor * config.CONGESTION_FACTOR)
         
         # Size-dependent transmission delay
-        size_factor = packet.size / SimConfig.PACKET_SIZE_MAX
+        size_factor = packet.size * config.PACKET_SIZE_NORM
         transmission_delay = processing_delay * size_factor
         
         # Add realistic jitter based on load
-        load_factor = self.current_load / SimConfig.MAX_QUEUE_SIZE
+        load_factor = self.current_load * config.QUEUE_NORM
         jitter = random.uniform(1, 5) * (1 + load_factor)
         
         # Calculate queuing delay
@@ -42,34 +45,34 @@ class Satellite:
         if packet.queue_entry_time is not None:
             queue_time = (self.env.now - packet.queue_entry_time) * 1000
         
-        total_delay = propagation_delay + processing_delay + transmission_delay + jitter + queue_time
+        # Round trip propagation delay is precomputed by the config
+        total_delay = config.PROPAGATION_DELAY_MS + processing_delay + transmission_delay + jitter + queue_time
         return max(1, total_delay)  # Ensure minimum 1ms latency
     
     def calculate_energy(self, packet):
-        # Base energy consumption
-        energy = SimConfig.BASE_ENERGY
+        config = self.config
+        
+        # Base and processing energy are precomputed by the config
+        energy = config.PACKET_BASE_ENERGY
         
         # Size-dependent energy
-        size_energy = packet.size * SimConfig.ENERGY_PER_BYTE
+        size_energy = packet.size * config.ENERGY_PER_BYTE
         
         # Load-dependent factor
-        load_factor = 1 + (len(self.queue) / SimConfig.MAX_QUEUE_SIZE)
-        
-        # Add energy cost for processing
-        processing_energy = SimConfig.PROCESSING_DELAY * SimConfig.BASE_ENERGY
+        load_factor = 1 + len(self.queue) * config.QUEUE_NORM
         
         # Random variation based on conditions
         variation = random.uniform(0.9, 1.1)
         
-        return (energy + size_energy + processing_energy) * load_factor * variation
+        return (energy + size_energy) * load_factor * variation
     
     def monitor_health(self):
         """Monitor satellite health and performance"""
         while True:
-            yield self.env.timeout(SimConfig.METRIC_INTERVAL)
+            yield self.env.timeout(self.config.METRIC_INTERVAL)
             
             # Calculate current metrics
-            queue_utilization = len(self.queue) / SimConfig.MAX_QUEUE_SIZE
+            queue_utilization = len(self.queue) * self.config.QUEUE_NORM
             packet_rate = (self.total_packets) / max(1, self.env.now)
             
             # Log health status
@@ -87,36 +90,64 @@ class Satellite:
                 packet.processing_start_time = self.env.now
                 
                 # Simulate processing time
-                yield self.env.timeout(SimConfig.PROCESSING_DELAY)
-                
-                # Calculate metrics
-                latency = self.calculate_latency(packet)
-                energy = self.calculate_energy(packet)
-                self.bytes_transmitted += packet.size
-                
-                # Set completion time
-                packet.completion_time = self.env.now
+                yield self.env.timeout(self.config.PROCESSING_DELAY)
                 
-                # Update metrics
-                self.metrics.update_metrics(
-                    self.env.now,
-                    packet.size,
-                    latency,
-                    energy
-                )
-                
-                # Log packet transmission
-                if self.env.now - self.last_packet_time >= SimConfig.METRIC_INTERVAL:
-                    print(f"t={self.env.now:.1f}s: {self.name} sent {packet.size/1024:.1f}KB packet, "
-                          f"latency={latency:.2f}ms, energy={energy:.3f}mW")
-                    self.last_packet_time = self.env.now
+                if self.service is not None:
+                    self.record_service(packet)
+                else:
+                    self.serve_packet(packet)
             
-            yield self.env.timeout(SimConfig.TIME_STEP)
+            yield self.env.timeout(self.config.TIME_STEP)
+    
+    def serve_packet(self, packet):
+        """Compute and record the metrics of one served packet"""
+        # Calculate metrics
+        latency = self.calculate_latency(packet)
+        energy = self.calculate_energy(packet)
+        self.bytes_transmitted += packet.size
+        
+        # Set completion time
+        packet.completion_time = self.env.now
+        
+        # Update metrics
+        self.metrics.update_metrics(
+            self.env.now,
+            packet.size,
+            latency,
+            energy
+        )
+        
+        # Log packet transmission
+        if self.env.now - self.last_packet_time >= self.config.METRIC_INTERVAL:
+            self.log_transmission(self.env.now, packet.size, latency, energy)
+    
+    def record_service(self, packet):
+        """Hand a served packet to the batched metrics computation"""
+        self.bytes_transmitted += packet.size
+        packet.completion_time = self.env.now
+        
+        queue_time = 0
+        if packet.queue_entry_time is not None:
+            queue_time = (self.env.now - packet.queue_entry_time) * 1000
+        
+        # Capture the queue state the per-packet path would see now
+        self.service.add(self, self.env.now, packet.size,
+                         len(self.queue), self.current_load, queue_time)
+    
+    def flush_service(self):
+        """Record pending served packets before anything else is recorded"""
+        if self.service is not None:
+            self.service.flush()
+    
+    def log_transmission(self, time, size, latency, energy):
+        print(f"t={time:.1f}s: {self.name} sent {size/1024:.1f}KB packet, "
+              f"latency={latency:.2f}ms, energy={energy:.3f}mW")
+        self.last_packet_time = time
     
     def failure_cycle(self):
         """Simulate satellite failures and recovery"""
         while True:
-            yield self.env.timeout(random.expovariate(1.0/SimConfig.FAILURE_RATE))
+            yield self.env.timeout(random.expovariate(1.0/self.config.FAILURE_RATE))
             
             self.failed = True
             lost_packets = len(self.queue)
@@ -124,10 +155,11 @@ class Satellite:
             
             # Clear queue and update metrics
             self.queue.clear()
+            self.flush_service()
             self.metrics.update_metrics(
                 self.env.now,
                 0,
-                SimConfig.MAX_LATENCY,  # Maximum latency during failure
+                self.config.MAX_LATENCY,  # Maximum latency during failure
                 0,
                 lost_packets
             )
@@ -135,13 +167,13 @@ class Satellite:
             print(f"t={self.env.now:.1f}s: {self.name} FAILED - {lost_packets} packets lost")
             
             # Recovery period
-            yield self.env.timeout(SimConfig.RECOVERY_TIME)
+            yield self.env.timeout(self.config.RECOVERY_TIME)
             self.failed = False
             print(f"t={self.env.now:.1f}s: {self.name} RECOVERED")
     
     def drop_low_priority_packets(self):
         """Drop lowest priority packets when queue is congested"""
-        if len(self.queue) > SimConfig.MAX_QUEUE_SIZE * 0.9:
+        if len(self.queue) > self.config.MAX_QUEUE_SIZE * 0.9:
             num_to_drop = int(len(self.queue) * 0.1)  # Drop 10% of packets
             for _ in range(num_to_drop):
                 if self.queue:
@@ -154,22 +186,24 @@ class Satellite:
             packet.queue_entry_time = self.env.now
             
             # Check queue capacity
-            if len(self.queue) < SimConfig.MAX_QUEUE_SIZE:
+            if len(self.queue) < self.config.MAX_QUEUE_SIZE:
                 self.queue.append(packet)
                 self.total_packets += 1
             else:
                 # Queue full - implement congestion control
                 self.drop_low_priority_packets()
                 self.lost_packets += 1
+                self.flush_service()
                 self.metrics.update_metrics(
-                    self.env.now, 0, SimConfig.MAX_LATENCY, 0, packets_lost=1
+                    self.env.now, 0, self.config.MAX_LATENCY, 0, packets_lost=1
                 )
                 print(f"t={self.env.now:.1f}s: {self.name} dropped packet (queue full)")
         else:
             # Satellite failed - count as lost packet
             self.lost_packets += 1
+            self.flush_service()
             self.metrics.update_metrics(
-                self.env.now, 0, SimConfig.MAX_LATENCY, 0, packets_lost=1
+                self.env.now, 0, self.config.MAX_LATENCY, 0, packets_lost=1
             )
             print(f"t={self.env.now:.1f}s: {self.name} dropped packet (failed)")
 
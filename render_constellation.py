@@ -0,0 +1,16 @@
+import sys
+from utils.constellation import ConstellationRenderer, load_recording, RECORDING_FILE
+
+def render_constellation(path=f'plots/{RECORDING_FILE}', output_dir='plots'):
+    """Render the last frame and an animation of a constellation recording"""
+    recording = load_recording(path)
+    renderer = ConstellationRenderer(recording, output_dir=output_dir)
+    try:
+        print(f"Rendering {len(recording['time'])} frames of {recording['load'].shape[1]} satellites")
+        print(f"Final frame saved in '{renderer.render_frame()}'")
+        print(f"Animation saved in '{renderer.animate()}'")
+    finally:
+        renderer.close()
+
+if __name__ == "__main__":
+    render_constellation(*sys.argv[1:])
@@ -0,0 +1,30 @@
+from config import DEFAULT_CONFIG
+from run_simulation import run_simulation, setup_logging
+from utils import ReplicationManager
+
+def run_replications(config=DEFAULT_CONFIG):
+    """Run seeded replications until the summary metrics are precise enough"""
+    logger, log_filename = setup_logging()
+
+    manager = ReplicationManager(run_simulation, config, truncate_warmup=True)
+    logger.info(f"\nRunning between {manager.min_replications} and {manager.max_replications} "
+                f"replications on {manager.n_workers} workers")
+    logger.info(f"Target relative precision: {config.REPLICATION_PRECISION:.1%} "
+                f"at {config.CONFIDENCE_LEVEL:.0%} confidence")
+
+    result = manager.run()
+
+    logger.info(f"\nReplications completed: {result['replications']} "
+                f"({'converged' if result['converged'] else 'not converged'})")
+    for metric, interval in result['intervals'].items():
+        logger.info(f"- {metric}: {interval['mean']:.4f} "
+                    f"[{interval['lower']:.4f}, {interval['upper']:.4f}] "
+                    f"(+/-{interval['relative_precision']:.2%})")
+    if result['cache'] is not None:
+        logger.info(f"Result cache: {result['cache']['hits']} hits, {result['cache']['misses']} misses")
+
+    logger.info(f"Logs saved in '{log_filename}'")
+    return result
+
+if __name__ == "__main__":
+    run_replications()
@@ -1,12 +1,16 @@
 import os
+import random
 import time
 import sys
 import logging
 from datetime import datetime
 import simpy
-from config import SimConfig
-from models import Satellite, D2DDevice
+from config import DEFAULT_CONFIG
+from models import Satellite, D2DDevice, ServiceBatcher
 from utils import MetricsCollector, plot_all_metrics
+from utils.cache import get_cache
+from utils.memory import MemoryMonitor, memory_instrumented
+from utils.constellation import ConstellationRecorder, RECORDING_FILE
 
 def setup_logging():
     """Setup logging with both file and console handlers"""
@@ -39,13 +43,13 @@ def setup_logging():
     
     return logger, file_handler.baseFilename
 
-def monitor_simulation_speed(env, start_time, logger):
+def monitor_simulation_speed(env, config, start_time, logger):
     """Monitor the simulation execution speed and time dilation"""
     last_sim_time = 0
     last_real_time = start_time
     
     while True:
-        yield env.timeout(SimConfig.PROGRESS_INTERVAL)
+        yield env.timeout(config.PROGRESS_INTERVAL)
         
         current_real_time = time.time()
         current_sim_time = env.now
@@ -61,10 +65,10 @@ def monitor_simulation_speed(env, start_time, logger):
         last_sim_time = current_sim_time
         last_real_time = current_real_time
 
-def monitor_resources(env, satellites, metrics, logger):
+def monitor_resources(env, config, satellites, metrics, logger):
     """Monitor system resources and simulation state"""
     while True:
-        yield env.timeout(SimConfig.PROGRESS_INTERVAL)
+        yield env.timeout(config.PROGRESS_INTERVAL)
         
         # Log satellite states
         for sat in satellites:
@@ -74,7 +78,21 @@ def monitor_resources(env, satellites, metrics, logger):
                       f"Processed={sat.total_packets}, "
                       f"Lost={sat.lost_packets}")
 
-def run_simulation():
+def log_cache_statistics(cache, logger):
+    stats = cache.get_statistics()
+    logger.info(f"Result cache: {stats['hits']} hits, {stats['misses']} misses, "
+                f"{stats['evictions']} evictions ({stats['hit_rate']*100:.1f}% hit rate)")
+
+def run_simulation(config=DEFAULT_CONFIG, seed=None, generate_plots=True):
+    """Run one simulation and return its MetricsCollector
+
+    All parameters come from the given SimConfig instance, so scenarios
+    with different parameters can run in the same process. Passing a seed
+    makes the run reproducible, which is what independent replications
+    rely on. Seeded runs are served from the result cache when the same
+    configuration and model sources were simulated before.
+    """
+    memory_monitor = None
     try:
         # Setup logging
         logger, log_filename = setup_logging()
@@ -85,36 +103,67 @@ def run_simulation():
             if not os.path.exists(directory):
                 os.makedirs(directory)
         
+        # Reuse the result of an identical earlier run; constellation
+        # recordings are not cached, so recording runs always simulate
+        cache = None
+        if config.CACHE_ENABLED and seed is not None and not config.CONSTELLATION_RECORD_INTERVAL:
+            cache = get_cache(config)
+            cache_key = cache.key(config, seed)
+        # Memory instrumentation measures a real run, which is still stored
+        if cache is not None and not memory_instrumented(config):
+            state = cache.load(cache_key)
+            if state is not None:
+                metrics = MetricsCollector(config)
+                metrics.load_state(state)
+                logger.info(f"\nResult cache hit for seed {seed} ({cache_key[:12]})")
+                if generate_plots and not cache.restore_plots(cache_key, 'plots'):
+                    plot_files = plot_all_metrics(metrics.metrics, metrics.interval_data, config)
+                    cache.store_plots(cache_key, plot_files)
+                log_cache_statistics(cache, logger)
+                return metrics
+        
         # Initialize simulation
+        if seed is not None:
+            random.seed(seed)
         env = simpy.Environment()
-        metrics = MetricsCollector()
+        metrics = MetricsCollector(config)
         
         # Create network components
         satellites = []
         devices = []
+        service = None
+        if config.SERVICE_BATCH_SIZE > 1:
+            service = ServiceBatcher(metrics, config)
         
-        logger.info(f"\nInitializing simulation for {SimConfig.SIM_TIME} seconds")
-        logger.info(f"Time step: {SimConfig.TIME_STEP} seconds")
-        logger.info(f"Packet rate: {SimConfig.PACKET_RATE} seconds")
+        logger.info(f"\nInitializing simulation for {config.SIM_TIME} seconds")
+        logger.info(f"Time step: {config.TIME_STEP} seconds")
+        logger.info(f"Packet rate: {config.PACKET_RATE} seconds")
+        if seed is not None:
+            logger.info(f"Random seed: {seed}")
         
         # Create satellites and devices
-        for i in range(SimConfig.SATELLITE_COUNT):
-            satellite = Satellite(env, f'Sat-{i}', metrics)
+        for i in range(config.SATELLITE_COUNT):
+            satellite = Satellite(env, f'Sat-{i}', metrics, config, service)
             satellites.append(satellite)
-            device = D2DDevice(env, f'Device-{i}', satellite)
+            device = D2DDevice(env, f'Device-{i}', satellite, config)
             devices.append(device)
             logger.debug(f"Created Satellite-{i} and Device-{i}")
         
         # Add monitoring processes
-        env.process(monitor_simulation_speed(env, start_time, logger))
-        env.process(monitor_resources(env, satellites, metrics, logger))
+        env.process(monitor_simulation_speed(env, config, start_time, logger))
+        env.process(monitor_resources(env, config, satellites, metrics, logger))
+        if memory_instrumented(config):
+            memory_monitor = MemoryMonitor(env, config, metrics, satellites, logger)
+        recorder = None
+        if config.CONSTELLATION_RECORD_INTERVAL:
+            recorder = ConstellationRecorder(env, config, satellites)
         
         def print_progress():
             last_progress = 0
             while True:
-                yield env.timeout(SimConfig.PROGRESS_INTERVAL)
+                yield env.timeout(config.PROGRESS_INTERVAL)
                 current_time = env.now
-                progress = (current_time / SimConfig.SIM_TIME) * 100
+                progress = (current_time / config.SIM_TIME) * 100
                 elapsed_time = time.time() - start_time
                 
                 if progress > last_progress:
@@ -132,7 +181,13 @@ def run_simulation():
         
         # Run simulation
         logger.info("\nStarting simulation...")
-        env.run(until=SimConfig.SIM_TIME)
+        env.run(until=config.SIM_TIME)
+        
+        # Record served packets still waiting for a batched metrics update
+        if service is not None:
+            service.flush()
+        if memory_monitor is not None:
+            memory_monitor.stop()
         
         # Calculate final statistics
         end_time = time.time()
@@ -140,25 +195,46 @@ def run_simulation():
         
         logger.info("\nSimulation completed:")
         logger.info(f"- Real time taken: {total_time:.2f} seconds")
-        logger.info(f"- Simulation/real-time ratio: {SimConfig.SIM_TIME/total_time:.2f}x")
+        logger.info(f"- Simulation/real-time ratio: {config.SIM_TIME/total_time:.2f}x")
         logger.info(f"- Total packets transmitted: {metrics.total_packets}")
         logger.info(f"- Total packets lost: {metrics.lost_packets}")
         logger.info(f"- Final packet loss rate: {metrics.lost_packets/max(1, metrics.total_packets)*100:.2f}%")
-        logger.info(f"- Average throughput: {metrics.bytes_transmitted/SimConfig.SIM_TIME/1024/1024:.2f} MB/s")
+        logger.info(f"- Average throughput: {metrics.bytes_transmitted/config.SIM_TIME/1024/1024:.2f} MB/s")
+        
+        if recorder is not None:
+            recording_path = recorder.save(os.path.join('plots', RECORDING_FILE))
+            logger.info(f"Constellation recording saved in '{recording_path}'")
         
         # Generate plots
-        logger.info("\nGenerating plots...")
-        plot_all_metrics(metrics.metrics, metrics.interval_data)
+        plot_files = None
+        if generate_plots:
+            logger.info("\nGenerating plots...")
+            plot_files = plot_all_metrics(metrics.metrics, metrics.interval_data, config)
+            logger.info("\nPlots saved in 'plots' directory")
+        
+        if cache is not None:
+            # A run degraded by the memory budget has lost raw samples, and
+            # whether it degrades depends on the process, not on the config
+            if memory_monitor is not None and memory_monitor.degraded:
+                logger.info("Result not cached: raw samples were trimmed under the memory budget")
+            else:
+                cache.store(cache_key, metrics, plot_files)
+            log_cache_statistics(cache, logger)
         
-        logger.info("\nPlots saved in 'plots' directory")
         logger.info(f"Logs saved in '{log_filename}'")
         
+        return metrics
+        
     except Exception as e:
         if 'logger' in locals():
             logger.error(f"Simulation failed: {str(e)}", exc_info=True)
         else:
             print(f"Logging setup failed. Error: {str(e)}")
         raise
+    finally:
+        # Stop tracemalloc even if the simulation failed
+        if memory_monitor is not None:
+            memory_monitor.stop()
 
 if __name__ == "__main__":
     run_simulation()
@@ -1,4 +1,5 @@
 from .metrics import MetricsCollector
 from .visualization import plot_all_metrics
+from .replication import ReplicationManager
 
-__all__ = ['MetricsCollector', 'plot_all_metrics']
+__all__ = ['MetricsCollector', 'plot_all_metrics', 'ReplicationManager']
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import time
+from dataclasses import fields
+from functools import lru_cache
+from config import DEFAULT_CONFIG
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Sources whose behaviour determines the simulation output and plots;
+# config.py holds the formulas of the derived constants
+MODEL_SOURCES = ['config.py', 'run_simulation.py', 'models', 'utils/metrics.py', 'utils/visualization.py']
+
+# Parameters that do not change the result of a single run
+IGNORED_PARAMS = {
+    'CACHE_ENABLED', 'CACHE_DIR', 'CACHE_MAX_BYTES',
+    'REPLICATION_MIN', 'REPLICATION_MAX', 'REPLICATION_PRECISION',
+    'REPLICATION_BASE_SEED', 'CONFIDENCE_LEVEL', 'MSER_BATCH_SIZE',
+    # Memory instrumentation: instrumented runs always simulate, and only
+    # those that were not degraded by the budget are stored
+    'MEMORY_PROFILING', 'MEMORY_BUDGET_MB', 'MEMORY_SOFT_LIMIT', 'MEMORY_SPILL_DIR',
+    # Rendering only; recording runs are never cached
+    'ORBIT_PLANES', 'INCLINATION', 'WALKER_PHASING', 'ANIMATION_FPS'
+}
+
+RESULT_FILE = 'result.pkl'
+PLOTS_DIR = 'plots'
+TMP_PREFIX = '.tmp-'
+# Temporary directories older than this were left by an interrupted store
+STALE_TMP_SECONDS = 600
+
+def config_values(config):
+    """Effective simulation parameters; derived constants follow from these"""
+    return {
+        f.name: getattr(config, f.name)
+        for f in fields(config)
+        if f.init and f.name not in IGNORED_PARAMS
+    }
+
+@lru_cache(maxsize=None)
+def source_version():
+    """Hash of the model sources, so code changes invalidate old results"""
+    digest = hashlib.sha256()
+    for source in MODEL_SOURCES:
+        path = os.path.join(PACKAGE_ROOT, source)
+        if os.path.isdir(path):
+            files = sorted(os.path.join(path, f) for f in os.listdir(path) if f.endswith('.py'))
+        else:
+            files = [path]
+        for file_path in files:
+            digest.update(os.path.relpath(file_path, PACKAGE_ROOT).encode())
+            with open(file_path, 'rb') as f:
+                digest.update(f.read())
+    return digest.hexdigest()
+
+def _directory_size(path):
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, files in os.walk(path)
+        for name in files
+    )
+
+class ResultCache:
+    """Content-addressed on-disk cache of simulation results
+
+    Entries are keyed by a hash of the effective configuration, the seed and
+    the model source version. Each entry holds the collected metrics (raw
+    samples, interval data and summary) and optionally the rendered plots.
+    The total size is bounded and the least recently used entries are
+    evicted first.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CONFIG.CACHE_DIR, max_bytes=DEFAULT_CONFIG.CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if not os.path.exists(cache_dir):
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, config, seed):
+        payload = json.dumps({
+            'config': config_values(config),
+            'seed': seed,
+            'source': source_version()
+        }, sort_keys=True, default=repr)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def load(self, key):
+        """Return the cached state for key, or None on a miss"""
+        result_path = os.path.join(self._entry_dir(key), RESULT_FILE)
+        try:
+            with open(result_path, 'rb') as f:
+                state = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            self.misses += 1
+            return None
+
+        # Access time drives LRU eviction
+        os.utime(result_path)
+        self.hits += 1
+        return state
+
+    def store(self, key, metrics, plot_files=None):
+        """Store a finished run; concurrent writers of the same key are harmless"""
+        entry_dir = self._entry_dir(key)
+        if not os.path.exists(entry_dir):
+            state = metrics.get_state()
+            state['summary'] = metrics.get_performance_summary()
+            tmp_dir = tempfile.mkdtemp(dir=self.cache_dir, prefix=TMP_PREFIX)
+            try:
+                with open(os.path.join(tmp_dir, RESULT_FILE), 'wb') as f:
+                    pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.rename(tmp_dir, entry_dir)
+            except OSError:
+                # Another process stored the same entry first
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        if plot_files:
+            self.store_plots(key, plot_files)
+        self.evict(keep=key)
+
+    def store_plots(self, key, plot_files):
+        """Copy the plots a run wrote, and no other file, into its entry"""
+        entry_plots = os.path.join(self._entry_dir(key), PLOTS_DIR)
+        if os.path.exists(entry_plots):
+            return
+        tmp_dir = tempfile.mkdtemp(dir=self._entry_dir(key), prefix=TMP_PREFIX)
+        try:
+            for path in plot_files:
+                shutil.copy2(path, tmp_dir)
+            os.rename(tmp_dir, entry_plots)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def restore_plots(self, key, output_dir):
+        """Copy cached plots into output_dir; returns False if none are cached"""
+        entry_plots = os.path.join(self._entry_dir(key), PLOTS_DIR)
+        if not os.path.isdir(entry_plots):
+            return False
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+        for name in os.listdir(entry_plots):
+            shutil.copy2(os.path.join(entry_plots, name), output_dir)
+        return True
+
+    def evict(self, keep=None):
+        """Drop least recently used entries until the cache fits max_bytes
+
+        Temporary directories of interrupted stores, e.g. by a terminated
+        replication worker, are removed once they are stale.
+        """
+        stale = time.time() - STALE_TMP_SECONDS
+        entries = []
+        for key in os.listdir(self.cache_dir):
+            if key.startswith(TMP_PREFIX):
+                tmp_dir = os.path.join(self.cache_dir, key)
+                try:
+                    if os.path.getmtime(tmp_dir) < stale:
+                        shutil.rmtree(tmp_dir, ignore_errors=True)
+                except OSError:
+                    pass  # Renamed or removed by its writer meanwhile
+                continue
+            result_path = os.path.join(self._entry_dir(key), RESULT_FILE)
+            if key.startswith('.') or not os.path.exists(result_path):
+                continue
+            entries.append((os.path.getmtime(result_path), key, _directory_size(self._entry_dir(key))))
+
+        total = sum(size for _, _, size in entries)
+        for _, key, size in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self._entry_dir(key), ignore_errors=True)
+            total -= size
+            self.evictions += 1
+
+    def get_statistics(self):
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0
+        }
+
+_caches = {}
+
+def get_cache(config=DEFAULT_CONFIG):
+    """Process-wide cache for config's cache settings, shared by all runners"""
+    settings = (config.CACHE_DIR, config.CACHE_MAX_BYTES)
+    if settings not in _caches:
+        _caches[settings] = ResultCache(*settings)
+    return _caches[settings]
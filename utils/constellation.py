@@ -0,0 +1,211 @@
+import os
+from functools import lru_cache
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib import animation
+from config import DEFAULT_CONFIG
+
+EARTH_RADIUS = 6371          # km
+EARTH_MU = 398600.4418       # km^3/s^2, standard gravitational parameter
+
+RECORDING_FILE = 'constellation.npz'
+
+class ConstellationRecorder:
+    """Records the queue load and failure state of every satellite
+
+    A frame is taken every CONSTELLATION_RECORD_INTERVAL seconds. The
+    recording also stores the constellation geometry, so it can be
+    rendered later without the configuration that produced it.
+    """
+
+    def __init__(self, env, config, satellites):
+        self.env = env
+        self.config = config
+        self.satellites = satellites
+        self.times = []
+        self.load = []
+        self.failed = []
+        self.process = env.process(self.run())
+
+    def run(self):
+        while True:
+            self.record()
+            yield self.env.timeout(self.config.CONSTELLATION_RECORD_INTERVAL)
+
+    def record(self):
+        self.times.append(self.env.now)
+        self.load.append([len(sat.queue) for sat in self.satellites])
+        self.failed.append([sat.failed for sat in self.satellites])
+
+    def save(self, path):
+        config = self.config
+        np.savez_compressed(
+            path,
+            time=np.array(self.times, dtype=float),
+            load=np.array(self.load, dtype=np.int16),
+            failed=np.array(self.failed, dtype=bool),
+            names=np.array([sat.name for sat in self.satellites]),
+            max_queue_size=config.MAX_QUEUE_SIZE,
+            altitude=config.ALTITUDE,
+            orbit_planes=config.ORBIT_PLANES,
+            inclination=config.INCLINATION,
+            walker_phasing=config.WALKER_PHASING
+        )
+        return path
+
+def load_recording(path):
+    """Load a recording saved by ConstellationRecorder into a dict"""
+    with np.load(path) as data:
+        return {name: data[name] for name in data.files}
+
+def walker_positions(times, n_satellites, altitude, planes, inclination, phasing):
+    """ECI positions (km) of a Walker delta constellation, shape (frames, satellites, 3)
+
+    Satellites are spread evenly over the orbital planes and along each
+    plane on circular orbits. All frames are computed in one vectorized
+    pass.
+    """
+    radius = EARTH_RADIUS + altitude
+    mean_motion = np.sqrt(EARTH_MU / radius ** 3)  # rad/s
+    planes = max(1, min(int(planes), n_satellites))
+    per_plane = int(np.ceil(n_satellites / planes))
+
+    index = np.arange(n_satellites)
+    plane = index // per_plane
+    slot = index % per_plane
+    raan = 2 * np.pi * plane / planes
+    phase = 2 * np.pi * slot / per_plane + 2 * np.pi * phasing * plane / (planes * per_plane)
+    inc = np.radians(inclination)
+
+    # Argument of latitude for every frame and satellite
+    u = phase[None, :] + mean_motion * np.asarray(times, dtype=float)[:, None]
+    cos_u, sin_u = np.cos(u), np.sin(u)
+    cos_raan, sin_raan = np.cos(raan), np.sin(raan)
+
+    positions = np.empty(u.shape + (3,))
+    positions[..., 0] = radius * (cos_raan * cos_u - sin_raan * sin_u * np.cos(inc))
+    positions[..., 1] = radius * (sin_raan * cos_u + cos_raan * sin_u * np.cos(inc))
+    positions[..., 2] = radius * sin_u * np.sin(inc)
+    return positions
+
+@lru_cache(maxsize=4)
+def earth_mesh(resolution=40):
+    """Sphere mesh for the Earth, shared by every figure and frame"""
+    u = np.linspace(0, 2 * np.pi, resolution)
+    v = np.linspace(0, np.pi, resolution // 2)
+    x = EARTH_RADIUS * np.outer(np.cos(u), np.sin(v))
+    y = EARTH_RADIUS * np.outer(np.sin(u), np.sin(v))
+    z = EARTH_RADIUS * np.outer(np.ones(np.size(u)), np.cos(v))
+    return x, y, z
+
+class ConstellationRenderer:
+    """3D rendering and animation of a recorded constellation
+
+    The Earth is drawn once and all satellites share a single scatter
+    collection whose positions and colours are updated in place for each
+    frame, so the cost per frame does not depend on redrawing artists.
+    Satellites are coloured by queue load; failed satellites are shown in
+    a fixed colour.
+    """
+
+    def __init__(self, recording, config=DEFAULT_CONFIG, output_dir='plots'):
+        self.recording = recording
+        self.config = config
+        self.output_dir = output_dir
+        if not os.path.exists(output_dir):
+            os.makedirs(output_dir)
+
+        self.times = recording['time']
+        self.utilization = recording['load'] / float(recording['max_queue_size'])
+        self.failed = recording['failed']
+        self.positions = walker_positions(
+            self.times,
+            self.utilization.shape[1],
+            float(recording['altitude']),
+            int(recording['orbit_planes']),
+            float(recording['inclination']),
+            int(recording['walker_phasing'])
+        )
+
+        self.cmap = matplotlib.colormaps['viridis']
+        self.failed_color = np.array(matplotlib.colors.to_rgba('#e74c3c'))
+        self.fig = None
+
+    def _colors(self, frame):
+        colors = self.cmap(np.clip(self.utilization[frame], 0, 1))
+        colors[self.failed[frame]] = self.failed_color
+        return colors
+
+    def _setup(self):
+        """Create the figure, Earth and satellite artists once"""
+        if self.fig is not None:
+            return
+        self.fig = plt.figure(figsize=self.config.FIGURE_SIZES['constellation'])
+        ax = self.fig.add_subplot(111, projection='3d')
+
+        x, y, z = earth_mesh()
+        ax.plot_surface(x, y, z, color='lightgreen', alpha=0.4, linewidth=0,
+                        antialiased=False, shade=False)
+
+        position = self.positions[0]
+        self.scatter = ax.scatter(position[:, 0], position[:, 1], position[:, 2],
+                                  c=self._colors(0), s=8, depthshade=False)
+
+        limit = EARTH_RADIUS + float(self.recording['altitude']) * 1.5
+        ax.set_xlim([-limit, limit])
+        ax.set_ylim([-limit, limit])
+        ax.set_zlim([-limit, limit])
+        ax.set_box_aspect((1, 1, 1))
+        ax.set_xlabel('X (km)')
+        ax.set_ylabel('Y (km)')
+        ax.set_zlabel('Z (km)')
+        ax.grid(False)
+
+        mappable = matplotlib.cm.ScalarMappable(cmap=self.cmap, norm=matplotlib.colors.Normalize(0, 1))
+        self.fig.colorbar(mappable, ax=ax, shrink=0.6, label='Queue utilization')
+        self.title = ax.set_title('')
+
+    def update(self, frame):
+        """Move the satellites and recolour them for one frame"""
+        position = self.positions[frame]
+        self.scatter._offsets3d = (position[:, 0], position[:, 1], position[:, 2])
+        colors = self._colors(frame)
+        self.scatter.set_facecolor(colors)
+        self.scatter.set_edgecolor(colors)
+        self.title.set_text(
+            f"t={self.times[frame]:.1f}s, {int(self.failed[frame].sum())} of "
+            f"{self.failed.shape[1]} satellites failed"
+        )
+        return self.scatter, self.title
+
+    def render_frame(self, frame=-1, name='constellation'):
+        """Save a single frame as a still image"""
+        self._setup()
+        self.update(frame)
+        path = f'{self.output_dir}/{name}.png'
+        self.fig.savefig(path, dpi=self.config.DPI, bbox_inches='tight')
+        return path
+
+    def animate(self, name='constellation', fps=None, dpi=100, frames=None):
+        """Export the recording as an animation
+
+        Writes MP4 when ffmpeg is available and an animated GIF otherwise.
+        """
+        self._setup()
+        fps = fps or self.config.ANIMATION_FPS
+        frames = range(len(self.times)) if frames is None else frames
+
+        if animation.writers.is_available('ffmpeg'):
+            writer, path = animation.FFMpegWriter(fps=fps), f'{self.output_dir}/{name}.mp4'
+        else:
+            writer, path = animation.PillowWriter(fps=fps), f'{self.output_dir}/{name}.gif'
+
+        anim = animation.FuncAnimation(self.fig, self.update, frames=frames, blit=False)
+        anim.save(path, writer=writer, dpi=dpi)
+        return path
+
+    def close(self):
+        if self.fig is not None:
+            plt.close(self.fig)
+            self.fig = None
@@ -0,0 +1,153 @@
+import os
+import tracemalloc
+
+try:
+    import psutil
+except ImportError:  # Optional, /proc or getrusage are used instead
+    psutil = None
+
+MB = 1024 * 1024
+
+# Source files whose allocations are charged to each simulator subsystem
+SUBSYSTEMS = {
+    'metrics': ('utils/metrics.py',),
+    'satellites': ('models/satellite.py', 'models/service.py'),
+    'packets': ('models/packet.py', 'models/device.py'),
+    'simpy': ('/simpy/',),
+}
+
+def current_rss():
+    """Resident set size of this process in bytes"""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # Peak rather than current RSS, in KB on Linux
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def memory_instrumented(config):
+    """Whether runs of config measure memory, and so must actually simulate"""
+    return bool(config.MEMORY_PROFILING or config.MEMORY_BUDGET_MB)
+
+def subsystem_of(filename):
+    path = filename.replace(os.sep, '/')
+    for subsystem, patterns in SUBSYSTEMS.items():
+        if any(pattern in path for pattern in patterns):
+            return subsystem
+    return 'other'
+
+class MemoryMonitor:
+    """Samples memory use every PROGRESS_INTERVAL and enforces MEMORY_BUDGET_MB
+
+    Each sample logs the RSS, its growth rate and, with MEMORY_PROFILING,
+    the traced allocations per simulator subsystem. When the RSS reaches
+    MEMORY_SOFT_LIMIT of the budget, or is projected to before the next
+    sample, raw metric samples are no longer retained beyond the moving
+    average window (optionally spilled to MEMORY_SPILL_DIR).
+    """
+
+    def __init__(self, env, config, metrics, satellites, logger):
+        self.env = env
+        self.config = config
+        self.metrics = metrics
+        self.satellites = satellites
+        self.logger = logger
+        self.budget = config.MEMORY_BUDGET_MB * MB
+        self.degraded = False
+        self.samples = []
+        self.peak_rss = 0
+        self.stopped = False
+
+        self.owns_tracing = False
+        if config.MEMORY_PROFILING and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.owns_tracing = True
+
+        # Baseline for the growth rate
+        self.sample()
+        self.process = env.process(self.run())
+
+    def run(self):
+        while True:
+            yield self.env.timeout(self.config.PROGRESS_INTERVAL)
+            self.sample()
+
+    def attribute(self):
+        """Traced allocation size per subsystem in bytes"""
+        usage = dict.fromkeys(list(SUBSYSTEMS) + ['other'], 0)
+        snapshot = tracemalloc.take_snapshot()
+        for stat in snapshot.statistics('filename'):
+            usage[subsystem_of(stat.traceback[0].filename)] += stat.size
+        return usage
+
+    def sample(self):
+        rss = current_rss()
+        now = self.env.now
+        self.peak_rss = max(self.peak_rss, rss)
+
+        # Growth rate per simulated second since the previous sample
+        growth = 0
+        if self.samples:
+            last = self.samples[-1]
+            growth = last['growth']
+            if now > last['time']:
+                growth = (rss - last['rss']) / (now - last['time'])
+
+        usage = self.attribute() if tracemalloc.is_tracing() else {}
+        self.samples.append({'time': now, 'rss': rss, 'growth': growth, 'usage': usage})
+
+        self.logger.info(f"Memory: RSS={rss/MB:.1f}MB, growth={growth/MB:.3f}MB per sim-second")
+        if usage:
+            self.logger.info("Memory by subsystem: " + ", ".join(
+                f"{name}={size/MB:.1f}MB" for name, size in sorted(usage.items(), key=lambda item: -item[1])
+            ))
+        self.logger.debug(
+            f"Memory: {len(self.metrics.metrics['time'])} raw metric samples, "
+            f"{sum(len(sat.queue) for sat in self.satellites)} queued packets"
+        )
+
+        if self.budget:
+            self.enforce(rss, growth)
+
+    def enforce(self, rss, growth):
+        """Degrade before the RSS budget is exceeded"""
+        soft_limit = self.budget * self.config.MEMORY_SOFT_LIMIT
+        projected = rss + max(growth, 0) * self.config.PROGRESS_INTERVAL
+        if not self.degraded and projected < soft_limit:
+            return
+
+        if not self.degraded:
+            self.degraded = True
+            action = f"spilling to '{self.config.MEMORY_SPILL_DIR}'" if self.config.MEMORY_SPILL_DIR else "dropping"
+            self.logger.warning(
+                f"Memory: RSS {rss/MB:.1f}MB (projected {projected/MB:.1f}MB) near budget "
+                f"{self.budget/MB:.0f}MB, {action} raw metric samples"
+            )
+
+        # Keep trimming while degraded so raw samples stay bounded
+        dropped = self.metrics.trim_raw_samples(self.metrics.window_size, self.config.MEMORY_SPILL_DIR)
+        if dropped:
+            self.logger.debug(f"Memory: dropped {dropped} raw metric samples")
+        if rss > self.budget:
+            self.logger.error(f"Memory: RSS {rss/MB:.1f}MB exceeds budget {self.budget/MB:.0f}MB")
+
+    def stop(self):
+        """Log a final report and stop tracing if this monitor started it"""
+        if self.stopped:
+            return
+        self.stopped = True
+        self.sample()
+        first = self.samples[0]
+        last = self.samples[-1]
+        elapsed = max(last['time'] - first['time'], 1e-9)
+        self.logger.info(
+            f"Memory: peak RSS {self.peak_rss/MB:.1f}MB, average growth "
+            f"{(last['rss'] - first['rss'])/elapsed/MB:.3f}MB per sim-second"
+            + (f", {self.metrics.trimmed_samples} raw samples trimmed" if self.degraded else "")
+        )
+        if self.owns_tracing:
+            tracemalloc.stop()
+            self.owns_tracing = False
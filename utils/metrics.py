@@ -1,9 +1,11 @@
+import os
 from collections import defaultdict
 import numpy as np
-from config import SimConfig
+from config import DEFAULT_CONFIG
 
 class MetricsCollector:
-    def __init__(self):
+    def __init__(self, config=DEFAULT_CONFIG):
+        self.config = config
         self.clear_metrics()
         self.window_size = 50  # Size for moving averages
         
@@ -14,6 +16,27 @@ class MetricsCollector:
         self.total_packets = 0
         self.lost_packets = 0
         self.bytes_transmitted = 0
+        
+        # Aggregates of raw samples dropped by trim_raw_samples
+        self.trimmed_samples = 0
+        self.trimmed_bytes = 0
+        self.trimmed_latency = 0
+        self.trimmed_energy = 0
+        self.trimmed_peak_throughput = 0
+        self.trimmed_until = 0      # Time of the newest trimmed sample
+        self.trimmed_loss = 0       # Running loss ratio at that sample
+        self.spilled_chunks = 0
+        
+        # Totals of the samples recorded so far except the one that opened
+        # the current interval, and the peak throughput since that interval
+        # started; _process_interval_metrics snapshots them per interval
+        self.running_samples = 0
+        self.running_lost = 0
+        self.running_bytes = 0
+        self.running_latency = 0
+        self.running_energy = 0
+        self.running_peak = 0
+        
         self.current_window_metrics = {
             'throughput': [],
             'latency': [],
@@ -35,11 +58,74 @@ class MetricsCollector:
         self.metrics['packet_loss'].append(self.lost_packets / max(1, self.total_packets))
         
         # Update interval metrics
-        interval = int(time / SimConfig.METRIC_INTERVAL)
+        interval = int(time / self.config.METRIC_INTERVAL)
         if interval > self.current_interval:
             self._process_interval_metrics(interval)
             self.current_interval = interval
+        self._accumulate(1, packets_lost, bytes_sent, latency, energy, self.metrics['throughput'][-1])
+            
+    def update_metrics_batch(self, times, bytes_sent, latencies, energies):
+        """Update metrics for several served packets at once
+
+        Equivalent to calling update_metrics for each packet in order: the
+        batch is split where it enters a new metric interval, so interval
+        metrics are computed over the same samples.
+        """
+        n = len(times)
+        if n == 0:
+            return
+        
+        totals = np.arange(self.total_packets + 1, self.total_packets + n + 1)
+        throughput = (np.asarray(bytes_sent, dtype=float) / (1024 * 1024)).tolist()  # Convert to MB
+        latencies = np.asarray(latencies, dtype=float).tolist()
+        energies = np.asarray(energies, dtype=float).tolist()
+        samples = (
+            ('time', np.asarray(times, dtype=float).tolist()),
+            ('throughput', throughput),
+            ('latency', latencies),
+            ('energy', energies),
+            ('packet_loss', (self.lost_packets / totals).tolist())
+        )
+        sizes = np.asarray(bytes_sent).tolist()
+        
+        # Samples that start a new interval, as update_metrics would see them
+        intervals = (np.asarray(times) / self.config.METRIC_INTERVAL).astype(int)
+        reached = np.maximum.accumulate(np.concatenate(([self.current_interval], intervals)))
+        splits = (np.flatnonzero(intervals > reached[:-1]) + 1).tolist()
+        if not splits or splits[-1] != n:
+            splits.append(n)
+        
+        start = 0
+        for end in splits:
+            for name, values in samples:
+                self.metrics[name].extend(values[start:end])
+            self.total_packets += end - start
+            self.bytes_transmitted += int(sum(sizes[start:end]))
             
+            interval = int(intervals[end - 1])
+            if interval > self.current_interval:
+                # The last sample of the segment opens the new interval
+                if end - 1 > start:
+                    self._accumulate(end - 1 - start, 0, int(sum(sizes[start:end - 1])),
+                                     sum(latencies[start:end - 1]), sum(energies[start:end - 1]),
+                                     max(throughput[start:end - 1]))
+                self._process_interval_metrics(interval)
+                self.current_interval = interval
+                start = end - 1
+            self._accumulate(end - start, 0, int(sum(sizes[start:end])),
+                             sum(latencies[start:end]), sum(energies[start:end]),
+                             max(throughput[start:end]))
+            start = end
+    
+    def _accumulate(self, samples, lost, bytes_sent, latency, energy, peak):
+        """Add samples to the running totals"""
+        self.running_samples += samples
+        self.running_lost += lost
+        self.running_bytes += bytes_sent
+        self.running_latency += latency
+        self.running_energy += energy
+        self.running_peak = max(self.running_peak, peak)
+    
     def _process_interval_metrics(self, interval):
         """Process and store detailed metrics for the current interval"""
         if not self.metrics['time']:
@@ -49,7 +135,18 @@ class MetricsCollector:
         end_idx = len(self.metrics['time'])
         
         # Store basic interval data
-        self.interval_data['time'].append(interval * SimConfig.METRIC_INTERVAL)
+        self.interval_data['time'].append(interval * self.config.METRIC_INTERVAL)
+        
+        # Totals of every sample before this interval and the peak of the
+        # previous one, so summaries with a warm-up cut at the start of an
+        # interval stay exact after trim_raw_samples
+        self.interval_data['samples_before'].append(self.running_samples)
+        self.interval_data['lost_before'].append(self.running_lost)
+        self.interval_data['bytes_before'].append(self.running_bytes)
+        self.interval_data['latency_before'].append(self.running_latency)
+        self.interval_data['energy_before'].append(self.running_energy)
+        self.interval_data['previous_peak'].append(self.running_peak)
+        self.running_peak = 0
         
         # Enhanced throughput metrics
         throughput_values = self.metrics['throughput'][start_idx:end_idx]
@@ -81,7 +178,7 @@ class MetricsCollector:
         
         # Network utilization metrics
         self.interval_data['network_utilization'].append(
-            len(throughput_values) / (SimConfig.SATELLITE_COUNT * SimConfig.MAX_QUEUE_SIZE)
+            len(throughput_values) / self.config.NETWORK_CAPACITY
         )
     
     def get_window_statistics(self):
@@ -101,17 +198,147 @@ class MetricsCollector:
                 }
         return stats
     
-    def get_performance_summary(self):
-        """Get a comprehensive performance summary"""
+    def trim_raw_samples(self, keep, spill_dir=''):
+        """Drop all but the newest keep raw samples to bound memory
+
+        The aggregates get_performance_summary needs are kept as running
+        totals. With spill_dir the dropped samples are written there as
+        .npz chunks instead of being discarded. Returns the number dropped.
+        """
+        n_drop = len(self.metrics['time']) - keep
+        if n_drop <= 0:
+            return 0
+        
+        if spill_dir:
+            if not os.path.exists(spill_dir):
+                os.makedirs(spill_dir)
+            np.savez(os.path.join(spill_dir, f'raw_samples_{self.spilled_chunks:05d}.npz'),
+                     **{name: np.asarray(values[:n_drop]) for name, values in self.metrics.items()})
+            self.spilled_chunks += 1
+        
+        throughput = self.metrics['throughput'][:n_drop]
+        self.trimmed_samples += n_drop
+        self.trimmed_bytes += int(round(sum(throughput) * 1024 * 1024))
+        self.trimmed_latency += sum(self.metrics['latency'][:n_drop])
+        self.trimmed_energy += sum(self.metrics['energy'][:n_drop])
+        self.trimmed_peak_throughput = max(self.trimmed_peak_throughput, max(throughput))
+        self.trimmed_until = self.metrics['time'][n_drop - 1]
+        self.trimmed_loss = self.metrics['packet_loss'][n_drop - 1]
+        
+        for values in self.metrics.values():
+            del values[:n_drop]
+        return n_drop
+    
+    def get_state(self):
+        """Plain-data snapshot of everything collected so far"""
         return {
+            'metrics': dict(self.metrics),
+            'interval_data': dict(self.interval_data),
+            'current_interval': self.current_interval,
             'total_packets': self.total_packets,
             'lost_packets': self.lost_packets,
-            'packet_loss_rate': self.lost_packets / max(1, self.total_packets),
-            'total_bytes_transmitted': self.bytes_transmitted,
-            'average_throughput': self.bytes_transmitted / (1024 * 1024 * SimConfig.SIM_TIME),  # MB/s
-            'peak_throughput': max(self.metrics['throughput']) if self.metrics['throughput'] else 0,
-            'average_latency': np.mean(self.metrics['latency']) if self.metrics['latency'] else 0,
-            'total_energy_consumed': sum(self.metrics['energy']) if self.metrics['energy'] else 0,
-            'network_utilization': len(self.metrics['throughput']) / (SimConfig.SATELLITE_COUNT * SimConfig.MAX_QUEUE_SIZE)
+            'bytes_transmitted': self.bytes_transmitted,
+            'trimmed': (self.trimmed_samples, self.trimmed_bytes, self.trimmed_latency,
+                        self.trimmed_energy, self.trimmed_peak_throughput,
+                        self.trimmed_until, self.trimmed_loss),
+            'running': (self.running_samples, self.running_lost, self.running_bytes,
+                        self.running_latency, self.running_energy, self.running_peak)
         }
 
+    def load_state(self, state):
+        """Restore a snapshot produced by get_state"""
+        self.clear_metrics()
+        self.metrics.update(state['metrics'])
+        self.interval_data.update(state['interval_data'])
+        self.current_interval = state['current_interval']
+        self.total_packets = state['total_packets']
+        self.lost_packets = state['lost_packets']
+        self.bytes_transmitted = state['bytes_transmitted']
+        (self.trimmed_samples, self.trimmed_bytes, self.trimmed_latency,
+         self.trimmed_energy, self.trimmed_peak_throughput,
+         self.trimmed_until, self.trimmed_loss) = state['trimmed']
+        (self.running_samples, self.running_lost, self.running_bytes,
+         self.running_latency, self.running_energy, self.running_peak) = state['running']
+
+    def _warmup_index(self, warmup_time):
+        """Index of the first sample recorded at or after warmup_time"""
+        if warmup_time <= 0 or not self.metrics['time']:
+            return 0
+        after_warmup = np.asarray(self.metrics['time']) >= warmup_time
+        if not after_warmup.any():
+            return len(self.metrics['time'])
+        return int(np.argmax(after_warmup))
+
+    def _interval_start(self, warmup_time):
+        """Index of the metric interval starting at warmup_time, or None"""
+        starts = np.asarray(self.interval_data['time'], dtype=float)
+        matches = np.flatnonzero(np.isclose(starts, warmup_time, rtol=0, atol=1e-9))
+        return int(matches[0]) if len(matches) else None
+
+    def get_performance_summary(self, warmup_time=0):
+        """Get a comprehensive performance summary
+
+        Samples recorded before warmup_time are left out, so a truncated
+        warm-up period does not bias the steady-state estimates. Samples
+        dropped by trim_raw_samples are included through their aggregates.
+        A warm-up cut within the trimmed samples is answered from the
+        per-interval totals, so it must fall on the start of a metric
+        interval, as MSER cuts do.
+        """
+        if self.trimmed_samples and 0 < warmup_time <= self.trimmed_until:
+            index = self._interval_start(warmup_time)
+            if index is None:
+                raise ValueError(
+                    f"Warm-up time {warmup_time}s falls within the raw samples trimmed "
+                    f"up to t={self.trimmed_until}s and is not the start of a metric interval"
+                )
+            data = self.interval_data
+            total_packets = self.total_packets - data['samples_before'][index]
+            lost_packets = self.lost_packets - data['lost_before'][index]
+            bytes_transmitted = self.bytes_transmitted - data['bytes_before'][index]
+            samples = total_packets
+            average_latency = (self.running_latency - data['latency_before'][index]) / max(1, samples)
+            energy = self.running_energy - data['energy_before'][index]
+            peak = max(data['previous_peak'][index + 1:] + [self.running_peak])
+        else:
+            start = self._warmup_index(warmup_time)
+            total_packets = self.total_packets
+            lost_packets = self.lost_packets
+            bytes_transmitted = self.bytes_transmitted
+            trimmed_samples = self.trimmed_samples
+            trimmed_latency = self.trimmed_latency
+            trimmed_energy = self.trimmed_energy
+            trimmed_peak = self.trimmed_peak_throughput
+            if warmup_time > 0:
+                # Every trimmed sample is older than warmup_time, so it falls
+                # into the warm-up period along with the retained ones before start
+                before = trimmed_samples + start
+                # packet_loss holds the running loss ratio after each update
+                loss_ratio = self.metrics['packet_loss'][start - 1] if start else self.trimmed_loss
+                total_packets -= before
+                lost_packets -= int(round(loss_ratio * before))
+                bytes_transmitted -= self.trimmed_bytes + int(round(sum(self.metrics['throughput'][:start]) * 1024 * 1024))
+                trimmed_samples = trimmed_latency = trimmed_energy = trimmed_peak = 0
+
+            throughput = self.metrics['throughput'][start:]
+            latency = self.metrics['latency'][start:]
+            samples = trimmed_samples + len(throughput)
+            if trimmed_samples:
+                average_latency = (trimmed_latency + sum(latency)) / samples
+            else:
+                average_latency = np.mean(latency) if latency else 0
+            energy = trimmed_energy + sum(self.metrics['energy'][start:])
+            peak = max(max(throughput, default=0), trimmed_peak)
+
+        duration = max(self.config.SIM_TIME - warmup_time, self.config.METRIC_INTERVAL)
+        return {
+            'total_packets': total_packets,
+            'lost_packets': lost_packets,
+            'packet_loss_rate': lost_packets / max(1, total_packets),
+            'total_bytes_transmitted': bytes_transmitted,
+            'average_throughput': bytes_transmitted / (1024 * 1024 * duration),  # MB/s
+            'peak_throughput': peak,
+            'average_latency': average_latency,
+            'total_energy_consumed': energy,
+            'network_utilization': samples / self.config.NETWORK_CAPACITY
+        }
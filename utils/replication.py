@@ -0,0 +1,265 @@
+import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from statistics import NormalDist
+import numpy as np
+from config import DEFAULT_CONFIG
+from .cache import get_cache
+from .memory import memory_instrumented
+from .metrics import MetricsCollector
+
+# Summary metrics that get a confidence interval
+SUMMARY_METRICS = [
+    'packet_loss_rate',
+    'average_throughput',
+    'peak_throughput',
+    'average_latency',
+    'total_energy_consumed',
+    'network_utilization'
+]
+
+# Totals over the samples after the warm-up cut; with per-replication
+# truncation they cover windows of different lengths and are not comparable
+WINDOW_TOTAL_METRICS = ['total_energy_consumed', 'network_utilization']
+
+# Metrics that must reach the requested precision before stopping
+DEFAULT_TARGET_METRICS = ['packet_loss_rate', 'average_throughput', 'average_latency']
+
+def t_quantile(p, df):
+    """Student-t quantile via the Cornish-Fisher expansion of the normal quantile"""
+    if df <= 0:
+        return math.inf
+    # Closed forms where the expansion is inaccurate
+    if df == 1:
+        return math.tan(math.pi * (p - 0.5))
+    if df == 2:
+        return (2 * p - 1) / math.sqrt(2 * p * (1 - p))
+
+    z = NormalDist().inv_cdf(p)
+    z2 = z * z
+    g1 = (z2 + 1) * z / 4
+    g2 = ((5 * z2 + 16) * z2 + 3) * z / 96
+    g3 = (((3 * z2 + 19) * z2 + 17) * z2 - 15) * z / 384
+    g4 = ((((79 * z2 + 776) * z2 + 1482) * z2 - 1920) * z2 - 945) * z / 92160
+    return z + g1 / df + g2 / df ** 2 + g3 / df ** 3 + g4 / df ** 4
+
+def mser_truncation(series, batch_size=5):
+    """Number of leading observations to discard as warm-up (MSER-m rule)
+
+    The series is averaged in batches of batch_size and the truncation point
+    minimising the marginal standard error of the remaining batches is
+    chosen. Only the first half of the run is considered, as recommended.
+    """
+    data = np.asarray(series, dtype=float)
+    n_batches = len(data) // batch_size
+    if n_batches < 2:
+        return 0
+
+    batches = data[:n_batches * batch_size].reshape(n_batches, batch_size).mean(axis=1)
+    suffix_sum = np.cumsum(batches[::-1])[::-1]
+    suffix_sq = np.cumsum(batches[::-1] ** 2)[::-1]
+
+    d = np.arange(n_batches // 2 + 1)
+    remaining = n_batches - d
+    squared_error = suffix_sq[d] - suffix_sum[d] ** 2 / remaining
+    return int(np.argmin(squared_error / remaining ** 2)) * batch_size
+
+def confidence_interval(values, confidence=0.95):
+    """Mean and t-based confidence interval of independent samples"""
+    samples = np.asarray(values, dtype=float)
+    n = len(samples)
+    mean = float(np.mean(samples)) if n else 0.0
+    if n < 2:
+        half_width = math.inf
+    else:
+        std_error = float(np.std(samples, ddof=1)) / math.sqrt(n)
+        half_width = t_quantile(0.5 + confidence / 2, n - 1) * std_error
+
+    if half_width == 0:
+        relative_precision = 0.0
+    elif mean != 0:
+        relative_precision = half_width / abs(mean)
+    else:
+        relative_precision = math.inf
+
+    return {
+        'mean': mean,
+        'half_width': half_width,
+        'lower': mean - half_width,
+        'upper': mean + half_width,
+        'relative_precision': relative_precision,
+        'count': n
+    }
+
+def _summarize_replication(metrics, seed, truncate_warmup, warmup_metric):
+    """Summary of one replication, optionally without its warm-up period"""
+    warmup_time = 0
+    if truncate_warmup:
+        cut = mser_truncation(metrics.interval_data[warmup_metric],
+                              metrics.config.MSER_BATCH_SIZE)
+        if cut > 0:
+            warmup_time = metrics.interval_data['time'][cut]
+
+    return {
+        'seed': seed,
+        'warmup_time': warmup_time,
+        'summary': metrics.get_performance_summary(warmup_time=warmup_time)
+    }
+
+def _run_replication(run_fn, config, seed, truncate_warmup, warmup_metric):
+    """Run one seeded replication in a worker process"""
+    metrics = run_fn(config=config, seed=seed, generate_plots=False)
+    return _summarize_replication(metrics, seed, truncate_warmup, warmup_metric)
+
+class ReplicationManager:
+    """Run independent seeded replications until the estimates are precise enough
+
+    Replications are executed in parallel worker processes. After every
+    completed replication the confidence intervals of the summary metrics
+    are updated, and no further replications are started once each target
+    metric reaches the requested relative precision. Seeds already in the
+    result cache are summarised from the cached run instead of re-simulated.
+    With truncate_warmup, totals over the post-warm-up window
+    (WINDOW_TOTAL_METRICS) get no confidence interval.
+    """
+
+    def __init__(self, run_fn, config=DEFAULT_CONFIG,
+                 target_metrics=None,
+                 n_workers=None,
+                 truncate_warmup=False,
+                 warmup_metric='avg_latency',
+                 cache=None):
+        self.run_fn = run_fn
+        self.config = config
+        self.target_metrics = target_metrics or DEFAULT_TARGET_METRICS
+        self.relative_precision = config.REPLICATION_PRECISION
+        self.confidence = config.CONFIDENCE_LEVEL
+        self.min_replications = max(2, config.REPLICATION_MIN)
+        self.max_replications = max(self.min_replications, config.REPLICATION_MAX)
+        self.base_seed = config.REPLICATION_BASE_SEED
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self.truncate_warmup = truncate_warmup
+        self.warmup_metric = warmup_metric
+        self.summary_metrics = [
+            metric for metric in SUMMARY_METRICS
+            if not (truncate_warmup and metric in WINDOW_TOTAL_METRICS)
+        ]
+        if cache is None and config.CACHE_ENABLED:
+            cache = get_cache(config)
+        self.cache = cache
+        self.logger = logging.getLogger('LEOSimulation')
+
+    def confidence_intervals(self, results):
+        """Confidence intervals of the summary metrics over the replications"""
+        return {
+            metric: confidence_interval(
+                [result['summary'][metric] for result in results],
+                self.confidence
+            )
+            for metric in self.summary_metrics
+        }
+
+    def precision_reached(self, intervals):
+        return all(
+            intervals[metric]['relative_precision'] <= self.relative_precision
+            for metric in self.target_metrics
+        )
+
+    def _load_cached(self, seed):
+        """Summary of a cached replication, or None if it must be simulated"""
+        if self.cache is None or memory_instrumented(self.config):
+            return None
+        state = self.cache.load(self.cache.key(self.config, seed))
+        if state is None:
+            return None
+        metrics = MetricsCollector(self.config)
+        metrics.load_state(state)
+        return _summarize_replication(metrics, seed, self.truncate_warmup, self.warmup_metric)
+
+    def _abandon(self, pool):
+        """Shut the pool down without waiting for replications no longer needed
+
+        Running futures cannot be cancelled, so their workers are terminated.
+        Cache entries are written atomically, so a terminated run leaves no
+        partial entry behind. The workers are found through the executor's
+        private _processes (CPython); without it running replications are
+        left to finish on their own.
+        """
+        workers = list((getattr(pool, '_processes', None) or {}).values())
+        pool.shutdown(wait=False, cancel_futures=True)
+        for worker in workers:
+            worker.terminate()
+        for worker in workers:
+            worker.join()
+
+    def run(self):
+        """Run replications and return the confidence intervals and raw summaries"""
+        results = []
+        finished = {}
+        pending = {}
+        next_seed = self.base_seed
+        last_seed = self.base_seed + self.max_replications
+        intervals = {}
+        converged = False
+
+        pool = ProcessPoolExecutor(max_workers=self.n_workers)
+        try:
+            while True:
+                # Keep every worker busy until the stopping rule fires.
+                # A cache hit is consumed right away so the stopping rule
+                # is checked before more cached runs are loaded.
+                cache_hit = False
+                while len(pending) < self.n_workers and next_seed < last_seed:
+                    cached = self._load_cached(next_seed)
+                    if cached is not None:
+                        finished[next_seed] = cached
+                        next_seed += 1
+                        cache_hit = True
+                        break
+                    future = pool.submit(_run_replication, self.run_fn, self.config, next_seed,
+                                         self.truncate_warmup, self.warmup_metric)
+                    pending[future] = next_seed
+                    next_seed += 1
+
+                if pending and not cache_hit:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        finished[pending.pop(future)] = future.result()
+
+                # Only consume replications in seed order so the stopping
+                # point does not depend on which worker finished first
+                while self.base_seed + len(results) in finished:
+                    results.append(finished.pop(self.base_seed + len(results)))
+                    intervals = self.confidence_intervals(results)
+                    self.logger.info(
+                        f"Replication {len(results)} done (seed={results[-1]['seed']}, "
+                        f"warm-up={results[-1]['warmup_time']:.1f}s)"
+                    )
+                    if len(results) >= self.min_replications and self.precision_reached(intervals):
+                        converged = True
+                        break
+
+                if converged or (not pending and next_seed >= last_seed):
+                    break
+        finally:
+            if pending:
+                self._abandon(pool)
+            else:
+                pool.shutdown()
+
+        if not converged:
+            self.logger.warning(
+                f"Precision {self.relative_precision:.1%} not reached after "
+                f"{len(results)} replications"
+            )
+
+        return {
+            'replications': len(results),
+            'converged': converged,
+            'confidence': self.confidence,
+            'intervals': intervals,
+            'warmup_times': [result['warmup_time'] for result in results],
+            'summaries': [result['summary'] for result in results],
+            'cache': self.cache.get_statistics() if self.cache is not None else None
+        }
@@ -3,11 +3,13 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import seaborn as sns
-from config import SimConfig
+from config import DEFAULT_CONFIG
 
 class Visualizer:
-    def __init__(self, output_dir='plots'):
+    def __init__(self, output_dir='plots', config=DEFAULT_CONFIG):
         self.output_dir = output_dir
+        self.config = config
+        self.saved_plots = []  # Paths written by save_plot
         if not os.path.exists(output_dir):
             os.makedirs(output_dir)
         
@@ -23,10 +25,10 @@ class Visualizer:
         }
     
     def plot_throughput(self, interval_data):
-        fig = plt.figure(figsize=SimConfig.FIGURE_SIZES['throughput'])
+        fig = plt.figure(figsize=self.config.FIGURE_SIZES['throughput'])
         plt.bar(interval_data['time'],
                 interval_data['avg_throughput'],
-                width=SimConfig.METRIC_INTERVAL * 0.8,
+                width=self.config.METRIC_INTERVAL * 0.8,
                 color=self.colors['throughput'],
                 alpha=0.7)
         plt.title('Average Throughput per Interval')
@@ -36,7 +38,7 @@ class Visualizer:
         self.save_plot(fig, 'throughput')
     
     def plot_latency(self, metrics):
-        fig = plt.figure(figsize=SimConfig.FIGURE_SIZES['latency'])
+        fig = plt.figure(figsize=self.config.FIGURE_SIZES['latency'])
         
         # Create subplots
         gs = plt.GridSpec(1, 2)
@@ -77,7 +79,7 @@ class Visualizer:
                 self.save_plot(fig, 'latency_heatmap')
     
     def plot_energy(self, metrics):
-        fig = plt.figure(figsize=SimConfig.FIGURE_SIZES['energy'])
+        fig = plt.figure(figsize=self.config.FIGURE_SIZES['energy'])
         
         time_array = np.array(metrics['time'])
         energy_array = np.array(metrics['energy'])
@@ -98,7 +100,7 @@ class Visualizer:
         self.save_plot(fig, 'energy')
     
     def plot_packet_loss(self, interval_data):
-        fig = plt.figure(figsize=SimConfig.FIGURE_SIZES['packet_loss'])
+        fig = plt.figure(figsize=self.config.FIGURE_SIZES['packet_loss'])
         plt.plot(interval_data['time'],
                 interval_data['packet_loss_rate'],
                 color=self.colors['packet_loss'])
@@ -110,7 +112,7 @@ class Visualizer:
     
     def plot_combined_metrics(self, interval_data):
         try:
-            fig = plt.figure(figsize=SimConfig.FIGURE_SIZES['combined'])
+            fig = plt.figure(figsize=self.config.FIGURE_SIZES['combined'])
             
             metrics_to_plot = {
                 'Throughput': ('avg_throughput', 'throughput'),
@@ -141,23 +143,26 @@ class Visualizer:
     def save_plot(self, fig, name):
         """Save plot with high resolution"""
         try:
-            fig.savefig(f'{self.output_dir}/{name}.png',
-                       dpi=SimConfig.DPI,
+            path = f'{self.output_dir}/{name}.png'
+            fig.savefig(path,
+                       dpi=self.config.DPI,
                        bbox_inches='tight')
             plt.close(fig)
+            self.saved_plots.append(path)
         except Exception as e:
             print(f"Error saving plot {name}: {str(e)}")
             raise
 
-def plot_all_metrics(metrics, interval_data):
-    """Main function to generate all plots"""
+def plot_all_metrics(metrics, interval_data, config=DEFAULT_CONFIG, output_dir='plots'):
+    """Main function to generate all plots, returns the paths written"""
     try:
-        visualizer = Visualizer()
+        visualizer = Visualizer(output_dir, config)
         visualizer.plot_throughput(interval_data)
         visualizer.plot_latency(metrics)
         visualizer.plot_energy(metrics)
         visualizer.plot_packet_loss(interval_data)
         visualizer.plot_combined_metrics(interval_data)
+        return visualizer.saved_plots
     except Exception as e:
         print(f"Error in plot_all_metrics: {str(e)}")
         raise